@@ -1,25 +1,88 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import text, bindparam
 from database import get_db1, get_db2
 
 
 # Initialiser le routeur
 router = APIRouter()
 
+# Colonnes exposées par /custom_query et expression SQL correspondante
+CUSTOM_QUERY_COLUMNS = {
+    "rome_code": "rome_code",
+    "rome_label": "A.rome_label",
+    "contract_type": "contract_type",
+    "experience_required": "experience_required",
+    "experience_required_months": "experience_required_months",
+    "departement": "departement",
+    "code_postal": "A.code_postal",
+    "date_creation": "date_creation",
+    "calculated_salary": "calculated_salary",
+    "_geopoint": "_geopoint",
+}
+
+CustomQueryColumn = Literal[tuple(CUSTOM_QUERY_COLUMNS)]
+
+
 @router.get("/custom_query", tags=["Custom Queries"], summary="Récupère les données enrichies")
-def get_custom_data(db: Session = Depends(get_db1)):
-    query = """
-        SELECT rome_code, A.rome_label, contract_type, experience_required,
-               experience_required_months, departement, A.code_postal,
-               date_creation, calculated_salary, _geopoint
+def get_custom_data(
+    departement: Optional[List[str]] = Query(None, description="Un ou plusieurs départements"),
+    rome_code: Optional[List[str]] = Query(None, description="Un ou plusieurs codes ROME"),
+    contract_type: Optional[List[str]] = Query(None, description="Un ou plusieurs types de contrat (CDI, CDD, ...)"),
+    date_creation_min: Optional[date] = Query(None, description="Date de création minimale (incluse)"),
+    date_creation_max: Optional[date] = Query(None, description="Date de création maximale (incluse)"),
+    salary_min: Optional[float] = Query(None, ge=0, description="Salaire minimal (inclus)"),
+    salary_max: float = Query(90000, gt=0, description="Salaire maximal (exclu)"),
+    columns: Optional[List[CustomQueryColumn]] = Query(None, description="Colonnes à retourner (toutes par défaut)"),
+    db: Session = Depends(get_db1),
+):
+    """
+    Récupère les offres enrichies. Les filtres sont appliqués par la base de données
+    via des paramètres liés, et seules les colonnes demandées sont retournées.
+    """
+    if date_creation_min and date_creation_max and date_creation_min > date_creation_max:
+        raise HTTPException(status_code=422, detail="date_creation_min doit être antérieure à date_creation_max.")
+    if salary_min is not None and salary_min >= salary_max:
+        raise HTTPException(status_code=422, detail="salary_min doit être inférieur à salary_max.")
+
+    # Projection : colonnes demandées dans l'ordre, sans doublons
+    selected = list(dict.fromkeys(columns)) if columns else list(CUSTOM_QUERY_COLUMNS)
+    select_clause = ", ".join(CUSTOM_QUERY_COLUMNS[col] for col in selected)
+
+    # Filtres : conditions sur les colonnes brutes pour rester compatibles avec les index.
+    # Les dates sont passées en chaînes ISO, comme les littéraux des statistiques ('2024-01-01').
+    conditions = ["calculated_salary < :salary_max"]
+    params = {"salary_max": salary_max}
+    expanding = []
+    if salary_min is not None:
+        conditions.append("calculated_salary >= :salary_min")
+        params["salary_min"] = salary_min
+    if date_creation_min:
+        conditions.append("date_creation >= :date_creation_min")
+        params["date_creation_min"] = date_creation_min.isoformat()
+    if date_creation_max and date_creation_max < date.max:
+        # Borne exclusive au lendemain plutôt que DATE(date_creation) <= ...
+        conditions.append("date_creation < :date_creation_end")
+        params["date_creation_end"] = (date_creation_max + timedelta(days=1)).isoformat()
+    for name, values in (("departement", departement), ("rome_code", rome_code), ("contract_type", contract_type)):
+        # Ignorer les valeurs vides (champ de formulaire laissé vide)
+        values = [value.strip() for value in values or [] if value.strip()]
+        if values:
+            conditions.append(f"{name} IN :{name}")
+            params[name] = list(dict.fromkeys(values))
+            expanding.append(bindparam(name, expanding=True))
+
+    query = f"""
+        SELECT {select_clause}
         FROM jm_job A
         LEFT JOIN jm_rome B ON A.rome_label = B.rome_label
         LEFT JOIN jm_code_postaux C ON A.code_postal = C.code_postal
-        WHERE calculated_salary < 90000;
+        WHERE {" AND ".join(conditions)};
     """
     try:
-        results = db.execute(text(query))
+        results = db.execute(text(query).bindparams(*expanding), params)
         # Convertir les résultats en liste de dictionnaires
         data = [row._mapping for row in results]
         return data
@@ -63,6 +63,28 @@ def fetch_cleaned_data_from_api():
             st.error(f"Erreur lors de la récupération des données : {e}")
             st.stop()
 
+@st.cache_data
+def fetch_offres_du_jour_from_api(jour):
+    """
+    Récupère uniquement les offres du jour donné, avec les colonnes utiles à la carte.
+    Le filtrage est effectué par l'API.
+    """
+    params = {
+        "date_creation_min": jour.isoformat(),
+        "date_creation_max": jour.isoformat(),
+        "columns": ["code_postal", "date_creation", "_geopoint"],
+    }
+    try:
+        response = requests.get(API_URL, params=params, timeout=60)
+        response.raise_for_status()
+        data = response.json()
+        if not isinstance(data, list):
+            raise ValueError("Les données doivent être une liste.")
+        return pd.DataFrame(data, columns=params["columns"])
+    except Exception as e:
+        st.error(f"Erreur lors de la récupération des offres du jour : {e}")
+        return pd.DataFrame(columns=params["columns"])
+
 @st.cache_data
 def fetch_job_offer_stats():
     """
@@ -161,14 +183,6 @@ def plot_salary_distribution(data):
     ax.set_ylabel("Fréquence")
     st.pyplot(fig)
 
-# Fonction pour filtrer les offres du jour
-def filter_offres_du_jour(data):
-    today = date.today() - timedelta(days=1)
-    data['date_creation'] = pd.to_datetime(data['date_creation']).dt.date
-    offres_du_jour = data[data['date_creation'] == today]
-    return offres_du_jour
-
-
 def extract_lat_long(df, geopoint_col='_geopoint'):
     """
     Extrait les coordonnées latitude et longitude de la colonne '_geopoint' et les ajoute comme nouvelles colonnes.
@@ -199,8 +213,10 @@ def plot_map(data):
     """
     Affiche une carte avec des marqueurs pour chaque offre d'emploi basée sur les coordonnées latitude/longitude.
     """
-    # Filtrer les offres du jour
-    data = filter_offres_du_jour(data)
+    # Aucune offre à afficher (journée sans offre ou API indisponible)
+    if data.empty:
+        st.info("Aucune offre à afficher sur la carte pour cette journée.")
+        return
 
     # Extraire les coordonnées longitude et latitude
     data = extract_lat_long(data)
@@ -308,7 +324,7 @@ def main():
     #plot_offers_by_region(cleaned_data)  # Répartition des offres par département
 
     st.write("### Tour de France des Offres d'Emploi")
-    plot_map(cleaned_data)  # Carte des offres
+    plot_map(fetch_offres_du_jour_from_api(date.today() - timedelta(days=1)))  # Carte des offres
 
 
 